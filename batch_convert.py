@@ -0,0 +1,262 @@
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError:  # Windows : pas de rlimit, seule la surveillance /proc reste (Linux)
+    resource = None
+
+# Limites par document ; None désactive une limite.
+#   wall_time        -> secondes de conversion
+#   max_rss          -> mémoire ajoutée par le document, en octets : RLIMIT_DATA
+#                       dans le worker, plus surveillance du RSS (Linux : /proc)
+#   max_output_bytes -> taille du fichier produit, .gz / .br compris
+DEFAULT_LIMITS = {
+    "wall_time": 120.0,
+    "max_rss": 1024 * 1024 * 1024,
+    "max_output_bytes": 50 * 1024 * 1024,
+}
+POLL_INTERVAL = 0.1
+# un worker garde des caches (TEMPLATE_CACHE...) : il est remplacé après N documents
+MAX_TASKS_PER_WORKER = 20
+OUTPUT_SUFFIXES = ("", ".gz", ".br")
+
+
+def convert_document(input_path, output_path, pdf_options=None, excel_options=None):
+    ext = os.path.splitext(input_path)[1].lower()
+    if ext == ".pdf":
+        from pdf_to_html import extract_pdf_to_json
+        data = extract_pdf_to_json(input_path, **(pdf_options or {}))
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+    elif ext == ".xlsx":
+        from excel_to_html import convert_excel_to_html
+        convert_excel_to_html(input_path, output_path, **(excel_options or {}))
+    else:
+        raise ValueError(f"Extension non supportée : {ext}")
+
+
+class _WarningCollector(logging.Handler):
+    # Les convertisseurs journalisent leurs erreurs récupérées en WARNING ;
+    # seules celles-là rendent un document « dégradé ».
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def _proc_status(pid, field):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _rss_bytes(pid):
+    return _proc_status(pid, "VmRSS")
+
+
+def _limit_task_memory(max_rss):
+    # plafond dur pour ce document : mémoire déjà utilisée par le worker + max_rss.
+    # Une grosse allocation lève MemoryError au lieu d'épuiser la machine.
+    if resource is None or max_rss is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_DATA)
+    soft = (_proc_status("self", "VmData") or 0) + max_rss
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_DATA, (soft, hard))
+
+
+def _worker_main(conn, pdf_options, excel_options, max_rss):
+    # Boucle d'un worker isolé : un document à la fois, résultat renvoyé au parent.
+    collector = _WarningCollector()
+    logging.getLogger().addHandler(collector)
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        input_path, output_path = task
+        collector.messages = []
+        start = time.perf_counter()
+        try:
+            _limit_task_memory(max_rss)
+            convert_document(input_path, output_path, pdf_options, excel_options)
+            warnings = collector.messages
+            result = {
+                "status": "degraded" if warnings else "ok",
+                "reason": warnings[0] if warnings else None,
+                "warnings": warnings,
+            }
+        except MemoryError:
+            result = {"status": "failed", "reason": "memory", "warnings": collector.messages}
+        except Exception as e:
+            result = {"status": "failed", "reason": f"{type(e).__name__}: {e}", "warnings": collector.messages}
+        result["seconds"] = time.perf_counter() - start
+        conn.send(result)
+
+
+class _Worker:
+    def __init__(self, pdf_options, excel_options, max_rss):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_worker_main,
+                                               args=(child_conn, pdf_options, excel_options, max_rss),
+                                               daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task = None
+        self.started = None
+        self.rss_start = 0
+        self.tasks_done = 0
+
+    def submit(self, task):
+        self.task = task
+        self.started = time.monotonic()
+        # le RSS est mesuré par rapport au début du document, pas aux caches accumulés
+        self.rss_start = _rss_bytes(self.process.pid) or 0
+        self.conn.send(task)
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+
+def _output_bytes(output_path):
+    total = 0
+    for suffix in OUTPUT_SUFFIXES:
+        try:
+            total += os.path.getsize(output_path + suffix)
+        except OSError:
+            pass
+    return total
+
+
+def _remove_outputs(output_path):
+    for suffix in OUTPUT_SUFFIXES:
+        try:
+            os.remove(output_path + suffix)
+        except OSError:
+            pass
+
+
+def _check_output(result, output_path, max_output_bytes):
+    result["output_bytes"] = _output_bytes(output_path)
+    if result["status"] != "failed" and max_output_bytes is not None and result["output_bytes"] > max_output_bytes:
+        result.update(status="failed", reason="output_bytes")
+    if result["status"] == "failed":
+        # pas de sortie partielle sur le disque
+        _remove_outputs(output_path)
+        result["output_bytes"] = 0
+    return result
+
+
+def convert_batch(tasks, workers=None, limits=None, pdf_options=None, excel_options=None):
+    # tasks : liste de (chemin d'entrée, chemin de sortie).
+    # Chaque document tourne dans un worker séparé ; en cas de dépassement de
+    # limite ou de plantage, le worker est tué et remplacé.
+    limits = {**DEFAULT_LIMITS, **(limits or {})}
+    workers = workers or os.cpu_count() or 1
+    pending = list(tasks)
+    def new_worker():
+        return _Worker(pdf_options, excel_options, limits["max_rss"])
+
+    pool = [new_worker() for _ in range(min(workers, len(pending)))]
+    results = []
+
+    def finish(worker, result):
+        input_path, output_path = worker.task
+        result.update(input=input_path, output=output_path)
+        results.append(_check_output(result, output_path, limits["max_output_bytes"]))
+        worker.task = None
+        worker.tasks_done += 1
+        if worker.tasks_done >= MAX_TASKS_PER_WORKER and worker.process.is_alive():
+            worker.stop()
+            pool[pool.index(worker)] = new_worker()
+
+    def recycle(worker, reason):
+        worker.kill()
+        pool[pool.index(worker)] = new_worker()
+        finish(worker, {"status": "failed", "reason": reason, "warnings": [],
+                        "seconds": time.monotonic() - worker.started})
+
+    try:
+        while pending or any(w.task for w in pool):
+            for worker in pool:
+                if worker.task is None and pending:
+                    worker.submit(pending.pop(0))
+
+            busy = [w for w in pool if w.task]
+            ready = wait([w.conn for w in busy], timeout=POLL_INTERVAL)
+            for worker in busy:
+                if worker.conn in ready:
+                    try:
+                        result = worker.conn.recv()
+                    except EOFError:
+                        recycle(worker, f"crashed (exit code {worker.process.exitcode})")
+                        continue
+                    finish(worker, result)
+                elif not worker.process.is_alive():
+                    recycle(worker, f"crashed (exit code {worker.process.exitcode})")
+                elif limits["wall_time"] is not None and time.monotonic() - worker.started > limits["wall_time"]:
+                    recycle(worker, "wall_time")
+                elif (limits["max_rss"] is not None
+                      and (_rss_bytes(worker.process.pid) or 0) - worker.rss_start > limits["max_rss"]):
+                    recycle(worker, "memory")
+                elif (limits["max_output_bytes"] is not None
+                      and _output_bytes(worker.task[1]) > limits["max_output_bytes"]):
+                    recycle(worker, "output_bytes")
+    finally:
+        for worker in pool:
+            worker.stop()
+
+    # résultats dans l'ordre des tâches, pas dans l'ordre de fin
+    order = {tuple(task): i for i, task in enumerate(tasks)}
+    results.sort(key=lambda r: order[(r["input"], r["output"])])
+    return results
+
+
+def main():
+    output_dir = "sortie_html"
+    os.makedirs(output_dir, exist_ok=True)
+
+    tasks = []
+    for path in sorted(glob.glob(os.path.join("pdfs", "*.pdf")) + glob.glob(os.path.join("xlsx", "*.xlsx"))):
+        base = os.path.splitext(os.path.basename(path))[0]
+        ext = ".json" if path.endswith(".pdf") else ".html"
+        tasks.append((path, os.path.join(output_dir, base + ext)))
+
+    results = convert_batch(tasks)
+
+    for r in results:
+        icon = {"ok": "✅", "degraded": "⚠", "failed": "❌"}[r["status"]]
+        reason = f" ({r['reason']})" if r["reason"] else ""
+        print(f"{icon} {r['status']:<8} {r['seconds']:6.2f}s {r['output_bytes']:>10} o  {r['input']}{reason}")
+
+    counts = {s: sum(1 for r in results if r["status"] == s) for s in ("ok", "degraded", "failed")}
+    print(f"\n{counts['ok']} ok, {counts['degraded']} dégradés, {counts['failed']} en échec")
+
+
+if __name__ == "__main__":
+    main()
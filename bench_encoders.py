@@ -0,0 +1,79 @@
+import glob
+import io
+import zipfile
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+from image_encoder import ImageEncoder, ENCODER_PROFILES
+
+OUTPUT_FILE = "benchmark_encodeurs.md"
+# largeur typique après redimensionnement (300px affichés * DPR 2)
+BENCH_MAX_WIDTH = 600
+
+
+def collect_images():
+    images = []
+    for path in sorted(glob.glob("xlsx/*.xlsx")):
+        with zipfile.ZipFile(path) as zipf:
+            for name in zipf.namelist():
+                if name.startswith("xl/media/"):
+                    images.append((f"{path}:{name}", zipf.read(name)))
+    for path in sorted(glob.glob("pdfs/*.pdf")):
+        with fitz.open(path) as doc:
+            for page in doc:
+                for img in page.get_images(full=True):
+                    images.append((f"{path}:xref{img[0]}", doc.extract_image(img[0])["image"]))
+    return images
+
+
+def decode(data):
+    img = Image.open(io.BytesIO(data))
+    if img.mode in ("P", "LA"):
+        img = img.convert("RGBA")
+    elif img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGB")
+    if img.width > BENCH_MAX_WIDTH:
+        img = img.resize((BENCH_MAX_WIDTH, max(1, img.height * BENCH_MAX_WIDTH // img.width)), Image.LANCZOS)
+    img.load()
+    return img
+
+
+def main():
+    images = []
+    for name, data in collect_images():
+        try:
+            images.append(decode(data))
+        except Exception as e:
+            print(f"⚠ Image ignorée {name}: {e}")
+
+    lines = [
+        "# Benchmark des profils d'encodage",
+        "",
+        f"{len(images)} images (médias des classeurs de xlsx/ et images des PDF de pdfs/),",
+        f"ramenées à {BENCH_MAX_WIDTH}px de large au plus, encodées une fois par profil.",
+        "Généré par `python bench_encoders.py`.",
+        "",
+        "| profil | format | qualité | qualité icônes | options | secondes | octets | ms/image |",
+        "|---|---|---|---|---|---|---|---|",
+    ]
+    for profile in ENCODER_PROFILES:
+        encoder = ImageEncoder(profile)
+        settings = encoder.settings
+        for img in images:
+            encoder.encode(img)
+        entry = encoder.stats.get(profile, {"images": 0, "seconds": 0.0, "bytes": 0})
+        per_image = 1000 * entry["seconds"] / entry["images"] if entry["images"] else 0.0
+        options = ", ".join(f"{k}={v}" for k, v in settings["options"].items())
+        lines.append(f"| {profile} | {settings['format']} | {settings['quality']} | {settings['icon_quality']} | {options} | "
+                     f"{entry['seconds']:.3f} | {entry['bytes']} | {per_image:.1f} |")
+
+    report = "\n".join(lines)
+    print(report)
+    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+        f.write(report + "\n")
+    print(f"✅ Résultats enregistrés dans {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
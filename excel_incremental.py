@@ -0,0 +1,196 @@
+import hashlib
+import json
+import logging
+import os
+
+from excel_to_html import (
+    COMPACT_PRECISION, DEVICE_PIXEL_RATIO, compute_html_scale, extract_drawings, extract_styles_from_xml,
+    get_cell_style, get_sheet_layout, open_workbook, render_cell_html, render_image_html, write_html_page,
+)
+from image_encoder import ImageEncoder, DEFAULT_PROFILE
+from template_cache import freeze
+
+logger = logging.getLogger(__name__)
+
+# Les snapshots contiennent toutes les valeurs et images du classeur : ils vont
+# dans un dossier de cache séparé, jamais dans le dossier HTML servi.
+SNAPSHOT_DIR = os.path.join(".cache", "excel_snapshots")
+SNAPSHOT_VERSION = 3
+
+
+def snapshot_path(output_file, snapshot_dir=SNAPSHOT_DIR):
+    # un fichier par sortie, nommé d'après le chemin absolu du HTML
+    name = hashlib.sha1(os.path.abspath(output_file).encode('utf-8')).hexdigest()
+    return os.path.join(snapshot_dir, name + '.json')
+
+
+def empty_snapshot():
+    return {
+        'settings': None,
+        'styles_hash': None,
+        'col_widths': None,
+        'row_heights': None,
+        'cells': {},        # (ligne, colonne) -> (valeur, style_id)
+        'fragments': {},    # (ligne, colonne) -> HTML de la cellule
+        'cell_styles': {},  # style_id -> style résolu
+        'media': {},        # clé média -> data URI encodée
+    }
+
+
+def _cell_key(key):
+    return f"{key[0]},{key[1]}"
+
+
+def _parse_cell_key(text):
+    row, col = text.split(',')
+    return int(row), int(col)
+
+
+def _media_cache_key(key):
+    digest, target_w, profile = key
+    return f"{digest}:{target_w}:{profile}"
+
+
+def _parse_media_cache_key(text):
+    digest, target_w, profile = text.split(':', 2)
+    return digest, int(target_w), profile
+
+
+def load_snapshot(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return empty_snapshot()
+    except (OSError, ValueError) as e:
+        logger.warning("Snapshot illisible, régénération complète : %s", e)
+        return empty_snapshot()
+    if data.get('version') != SNAPSHOT_VERSION:
+        return empty_snapshot()
+
+    try:
+        return {
+            'settings': tuple(data['settings']),
+            'styles_hash': data['styles_hash'],
+            'col_widths': {int(k): v for k, v in data['col_widths'].items()},
+            'row_heights': {int(k): v for k, v in data['row_heights'].items()},
+            'cells': {_parse_cell_key(k): tuple(v) for k, v in data['cells'].items()},
+            'fragments': {_parse_cell_key(k): v for k, v in data['fragments'].items()},
+            'cell_styles': {int(k): freeze(v) for k, v in data['cell_styles'].items()},
+            'media': {_parse_media_cache_key(k): v for k, v in data['media'].items()},
+        }
+    except (KeyError, ValueError, TypeError, AttributeError) as e:
+        logger.warning("Snapshot invalide, régénération complète : %s", e)
+        return empty_snapshot()
+
+
+def save_snapshot(path, snapshot):
+    data = {
+        'version': SNAPSHOT_VERSION,
+        'settings': list(snapshot['settings']),
+        'styles_hash': snapshot['styles_hash'],
+        'col_widths': snapshot['col_widths'],
+        'row_heights': snapshot['row_heights'],
+        'cells': {_cell_key(k): list(v) for k, v in snapshot['cells'].items()},
+        'fragments': {_cell_key(k): v for k, v in snapshot['fragments'].items()},
+        'cell_styles': snapshot['cell_styles'],
+        'media': {_media_cache_key(k): v for k, v in snapshot['media'].items()},
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        # default=dict : les styles figés (MappingProxyType) s'écrivent comme des dict
+        json.dump(data, f, ensure_ascii=False, default=dict)
+    os.replace(tmp_path, path)
+
+
+def convert_excel_incremental(source, output_file, sheet_name=None, use_mmap=False, target_width=500,
+                              device_pixel_ratio=DEVICE_PIXEL_RATIO, profile=DEFAULT_PROFILE, time_budget=None,
+                              compact=False, precision=None, precompress=False, snapshot_dir=SNAPSHOT_DIR):
+    # Réexport d'un classeur déjà converti vers output_file : le snapshot
+    # (dans snapshot_dir) garde valeurs, style_id, dimensions, HTML de chaque
+    # cellule et médias encodés. Seules les cellules modifiées sont restylées
+    # et re-rendues, seuls les médias nouveaux sont encodés.
+    # Si les dimensions, styles.xml ou les options changent, tout est régénéré.
+    path = snapshot_path(output_file, snapshot_dir)
+    previous = load_snapshot(path)
+    encoder = ImageEncoder(profile, time_budget)
+    if compact and precision is None:
+        precision = COMPACT_PRECISION
+
+    with open_workbook(source, use_mmap) as (wb, zipf):
+        if sheet_name is None:
+            sheet_name = wb.sheetnames[0]
+        ws = wb[sheet_name]
+        col_widths, row_heights, zoom_scale = get_sheet_layout(wb, zipf, sheet_name)
+        new_width, new_height, scale_x, scale_y = compute_html_scale(col_widths, row_heights, target_width)
+
+        names = zipf.namelist()
+        styles_hash = hashlib.sha1(zipf.read('xl/styles.xml') if 'xl/styles.xml' in names else b'').hexdigest()
+        settings = (sheet_name, target_width, device_pixel_ratio, profile, compact, precision, zoom_scale)
+
+        full = (previous['settings'] != settings or previous['styles_hash'] != styles_hash
+                or previous['col_widths'] != col_widths or previous['row_heights'] != row_heights)
+        if full:
+            media = previous['media']
+            previous = empty_snapshot()
+            # les médias encodés restent valides : la clé inclut déjà la largeur cible et le profil
+            previous['media'] = media
+
+        cells = {}
+        fragments = {}
+        changed = []
+        cell_styles = previous['cell_styles']
+        styles = None
+        styles_failed = False
+        for row in ws.iter_rows():
+            for cell in row:
+                key = (cell.row, cell.column)
+                state = (str(cell.value if cell.value is not None else ""), getattr(cell, 'style_id', 0))
+                cells[key] = state
+                if previous['cells'].get(key) == state:
+                    fragments[key] = previous['fragments'][key]
+                    continue
+
+                style = cell_styles.get(state[1])
+                if style is None:
+                    if styles is None:
+                        styles = extract_styles_from_xml(zipf)
+                        if styles is None:
+                            styles, styles_failed = {}, True
+                    style = cell_styles[state[1]] = freeze(get_cell_style(cell, styles))
+                cell_data = {'value': state[0], 'style': style, 'row': cell.row, 'col': cell.column}
+                fragments[key] = render_cell_html(cell_data, col_widths, row_heights, scale_x, scale_y,
+                                                  zoom_scale, precision, compact)
+                changed.append(key)
+        removed = [key for key in previous['cells'] if key not in cells]
+
+        # les ancres sont relues (XML léger) ; seuls les médias absents du cache sont encodés
+        media_cache = dict(previous['media'])
+        all_images = extract_drawings(zipf, col_widths, row_heights, scale_x, device_pixel_ratio,
+                                      encoder, media_cache)
+        encoded = len(media_cache.keys() - previous['media'].keys())
+
+    parts = [fragments[key] for key in sorted(fragments)]
+    parts.extend(render_image_html(img, scale_x, scale_y, precision, compact) for img in all_images)
+    write_html_page(output_file, parts, new_width, new_height, compact, precompress)
+
+    used_uris = {img['data_uri'] for img in all_images}
+    save_snapshot(path, {
+        'settings': settings,
+        # styles.xml illisible : styles_hash vide, le prochain export repart de zéro
+        # au lieu de réutiliser des cellules rendues avec les styles par défaut
+        'styles_hash': None if styles_failed else styles_hash,
+        'col_widths': col_widths,
+        'row_heights': row_heights,
+        'cells': cells,
+        'fragments': fragments,
+        'cell_styles': cell_styles,
+        'media': {k: v for k, v in media_cache.items() if v in used_uris},
+    })
+
+    delta = {'full': full, 'changed_cells': changed, 'removed_cells': removed, 'encoded_images': encoded}
+    mode = "complète" if full else "incrémentale"
+    print(f"✅ Mise à jour {mode} de {output_file} : {len(changed)} cellule(s) modifiée(s), "
+          f"{len(removed)} supprimée(s), {encoded} image(s) encodée(s)")
+    return delta
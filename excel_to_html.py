@@ -1,21 +1,37 @@
 import zipfile
+import math
+import logging
+import gzip
+import brotli
 import xml.etree.ElementTree as ET
 import base64
+from contextlib import contextmanager
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
 from PIL import Image
 import io
 from openpyxl.utils import range_boundaries
+from input_source import open_source, BufferReader
+from image_encoder import ImageEncoder, DEFAULT_PROFILE
+from template_cache import TemplateCache, template_fingerprint, media_key, freeze
+
+# erreurs récupérées (image illisible, styles.xml invalide...) : niveau WARNING,
+# collectées par batch_convert pour marquer un document comme dégradé
+logger = logging.getLogger(__name__)
 
 EMU_PER_PIXEL = 9525
 PIXELS_PER_CHAR = 7  
 LINE_HEIGHT = 19     
 MAX_IMAGE_WIDTH = 300
-QUALITY = 50
 
 PIXELS_PER_POINT = 1.33  
 DEFAULT_COL_WIDTH = 8.43  
 DEFAULT_ROW_HEIGHT = 15  
+DEVICE_PIXEL_RATIO = 2.0
+# cache des modèles partagé par le processus (styles, styles résolus, médias)
+TEMPLATE_CACHE = TemplateCache()
+# formats affichés tels quels par le navigateur
+PASSTHROUGH_MIMES = {"PNG": "image/png", "JPEG": "image/jpeg", "WEBP": "image/webp", "GIF": "image/gif"}
    
 def argb_to_hex(argb):
     if argb is None:
@@ -95,7 +111,9 @@ def extract_styles_from_xml(zipf):
             }
 
     except Exception as e:
-        print(f"⚠ Erreur lors de la lecture du fichier styles.xml: {e}")
+        logger.warning("Erreur lors de la lecture du fichier styles.xml: %s", e)
+        # None : échec, à ne pas mettre en cache (get_cell_style retombe sur les styles par défaut)
+        return None
 
     return styles
 
@@ -149,8 +167,12 @@ def get_cell_style(cell, styles, ws=None):
 
     return style
 
-def get_sheet_data(wb, zipf, sheet_name=None):
-    styles = extract_styles_from_xml(zipf)
+def get_sheet_data(wb, zipf, sheet_name=None, styles=None, style_cache=None):
+    # style_cache : style résolu par style_id, partagé entre classeurs d'un même modèle
+    if styles is None:
+        styles = extract_styles_from_xml(zipf)
+    if style_cache is None:
+        style_cache = {}
     ws = wb[sheet_name] if sheet_name else wb.active
     data = []
 
@@ -158,7 +180,10 @@ def get_sheet_data(wb, zipf, sheet_name=None):
         row_data = []
         for cell in row:
             value = cell.value if cell.value is not None else ""
-            style = get_cell_style(cell, styles)
+            style_id = getattr(cell, 'style_id', 0)
+            style = style_cache.get(style_id)
+            if style is None:
+                style = style_cache[style_id] = freeze(get_cell_style(cell, styles))
             row_data.append({
                 'value': str(value),
                 'style': style,
@@ -169,37 +194,43 @@ def get_sheet_data(wb, zipf, sheet_name=None):
 
     return data
 
-def get_image_data(zipf, media_path):
+def get_image_data(zipf, media_path, target_width=MAX_IMAGE_WIDTH, encoder=None, data=None):
+    # None en cas d'échec : l'appelant choisit le repli (raw_image_data_uri) sans le mettre en cache
     try:
-        with zipf.open(media_path) as f:
-            data = f.read()
+        if data is None:
+            with zipf.open(media_path) as f:
+                data = f.read()
 
         img = Image.open(io.BytesIO(data))
 
+        # déjà à la taille affichée ou en dessous : on garde les octets d'origine
+        if img.format in PASSTHROUGH_MIMES and img.width <= target_width:
+            return f"data:{PASSTHROUGH_MIMES[img.format]};base64,{base64.b64encode(data).decode()}"
+
         if img.mode in ("P", "LA"):
             img = img.convert("RGBA")
         elif img.mode != "RGB":
             img = img.convert("RGB")
 
       
-        if img.width > MAX_IMAGE_WIDTH:
-            ratio = MAX_IMAGE_WIDTH / img.width
-            new_height = int(img.height * ratio)
-            img = img.resize((MAX_IMAGE_WIDTH, new_height), Image.LANCZOS)
+        if img.width > target_width:
+            ratio = target_width / img.width
+            new_height = max(1, int(img.height * ratio))
+            img = img.resize((target_width, new_height), Image.LANCZOS)
 
-        output = io.BytesIO()
-        img.save(output, format="WEBP", quality=QUALITY, method=6)
-        optimized_data = output.getvalue()
-        return f"data:image/webp;base64,{base64.b64encode(optimized_data).decode()}"
+        if encoder is None:
+            encoder = ImageEncoder()
+        return encoder.encode(img)
 
     except Exception as e:
-        print(f"⚠ Erreur lors du traitement de l'image {media_path}: {e}")
-        try:
-            ext = media_path.split('.')[-1].lower()
-            mime_fallback = "image/png" if ext == "png" else "image/jpeg"
-            return f"data:{mime_fallback};base64," + base64.b64encode(data).decode()
-        except:
-            return ""  
+        logger.warning("Erreur lors du traitement de l'image %s: %s", media_path, e)
+        return None
+
+def raw_image_data_uri(media_path, data):
+    # repli : octets d'origine, type deviné d'après l'extension
+    ext = media_path.split('.')[-1].lower()
+    mime_fallback = "image/png" if ext == "png" else "image/jpeg"
+    return f"data:{mime_fallback};base64," + base64.b64encode(data).decode()
 
 def column_width_to_pixels(width):
     if width is None:
@@ -246,14 +277,23 @@ def calculate_position(start_idx, offset_emu, dimensions, is_column=True):
                    for i in range(1, start_idx))
     return total + (offset_emu / EMU_PER_PIXEL)
 
-def parse_drawing(zipf, drawing_path, col_widths, row_heights):
+def target_image_width(width_px, scale, device_pixel_ratio):
+    # largeur utile en pixels = largeur de l'ancre * échelle HTML * DPR
+    if width_px <= 0:
+        return MAX_IMAGE_WIDTH
+    return max(1, math.ceil(width_px * scale * device_pixel_ratio))
+
+def parse_drawing(zipf, drawing_path, col_widths, row_heights, scale=1.0, device_pixel_ratio=DEVICE_PIXEL_RATIO,
+                  encoder=None, media_cache=None):
     try:
         rels_path = drawing_path.replace('drawings/', 'drawings/_rels/') + '.rels'
         with zipf.open(rels_path) as f:
             rels_root = ET.parse(f).getroot()
 
-        rels = {rel.attrib['Id']: rel.attrib['Target'].replace('../', 'xl/')
+        rels = {rel.attrib['Id']: rel.attrib['Target'].replace('../', 'xl/').lstrip('/')
                 for rel in rels_root.findall('{*}Relationship')}
+        names = set(zipf.namelist())
+        media_data = {}
 
         ns = {
             'xdr': 'http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing',
@@ -310,6 +350,27 @@ def parse_drawing(zipf, drawing_path, col_widths, row_heights):
             if embed not in rels:
                 continue
 
+            media_path = rels[embed]
+            if media_path not in names:
+                logger.warning("Média introuvable dans l'archive : %s", media_path)
+                continue
+            if media_path not in media_data:
+                # les octets sont relus : la clé du cache est l'empreinte du contenu réel
+                data = zipf.read(media_path)
+                media_data[media_path] = (data, media_key(data))
+            data, digest = media_data[media_path]
+            target_w = target_image_width(width_px, scale, device_pixel_ratio)
+            cache_key = (digest, target_w, encoder.profile if encoder else DEFAULT_PROFILE)
+            if media_cache is not None and cache_key in media_cache:
+                data_uri = media_cache[cache_key]
+            else:
+                data_uri = get_image_data(zipf, media_path, target_w, encoder, data)
+                if data_uri is None:
+                    # échec : repli pour ce document seulement, jamais mis en cache
+                    data_uri = raw_image_data_uri(media_path, data)
+                elif media_cache is not None:
+                    media_cache[cache_key] = data_uri
+
             images.append({
                 'row': row,
                 'col': col,
@@ -317,7 +378,7 @@ def parse_drawing(zipf, drawing_path, col_widths, row_heights):
                 'top': top,
                 'width': width_px,
                 'height': height_px,
-                'data_uri': get_image_data(zipf, rels[embed]),
+                'data_uri': data_uri,
                 'cell_width': col_widths.get(col, DEFAULT_COL_WIDTH) * PIXELS_PER_POINT,
                 'cell_height': row_heights.get(row, DEFAULT_ROW_HEIGHT) * PIXELS_PER_POINT
             })
@@ -325,7 +386,7 @@ def parse_drawing(zipf, drawing_path, col_widths, row_heights):
         return images
 
     except Exception as e:
-        print(f"⚠ Erreur lors de l'analyse du dessin: {e}")
+        logger.warning("Erreur lors de l'analyse du dessin: %s", e)
         return []
 
 def estimate_text_height(text, font_size=11, cell_width_px=100, wrap=True):
@@ -361,7 +422,7 @@ def get_sheet_zoom(zipf, sheet_path):
                     zoom_scale = int(sheetView.attrib['zoomScale'])
                     return zoom_scale
     except Exception as e:
-        print(f"⚠ Erreur en lisant le zoom de la feuille: {e}")
+        logger.warning("Erreur en lisant le zoom de la feuille: %s", e)
     return 100  
 
 def get_text_size(text, font_path, font_size, max_width=None):
@@ -425,9 +486,6 @@ def border_to_style_full(cell_style):
             css += f"border-{side}:{border_css};"
 
     return css
-from collections import defaultdict
-
-from collections import defaultdict
 def print_dimensions_before_after(col_widths, row_heights, target_width, tolerance=0.01):
     
     original_width = sum(col_widths.values()) * PIXELS_PER_POINT
@@ -456,9 +514,7 @@ def print_dimensions_before_after(col_widths, row_heights, target_width, toleran
         print("⚠ Le ratio d'aspect **n'est pas** respecté (avant et après extraction).")
     print("---------------------------------------------------")
 
-def generate_html(sheet_data, images, col_widths, row_heights, output_file, zoom_scale=100, target_width=500):
-    print_dimensions_before_after(col_widths, row_heights, target_width)
-
+def compute_html_scale(col_widths, row_heights, target_width):
     original_width = sum(col_widths.values()) * PIXELS_PER_POINT
     original_height = sum(h * PIXELS_PER_POINT for h in row_heights.values())
     aspect_ratio = original_width / original_height
@@ -467,153 +523,216 @@ def generate_html(sheet_data, images, col_widths, row_heights, output_file, zoom
     new_height = int(target_width / aspect_ratio)
     scale_x = new_width / original_width
     scale_y = new_height / original_height
+    return new_width, new_height, scale_x, scale_y
 
-    html = f"""<!DOCTYPE html>
+HTML_HEAD = """<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
     <title>Export Excel fidèle</title>
 </head>
 <body>
-<div style="position:relative;width:{new_width}px;height:{new_height}px;">
+<div style="position:relative;width:{width}px;height:{height}px;">
 """
+HTML_TAIL = """
+</div>
+</body>
+</html>
+"""
+COMPACT_HTML_HEAD = ('<!DOCTYPE html><html><head><meta charset="UTF-8"><title>Export Excel fidèle</title></head>'
+                     '<body><div style="position:relative;width:{width}px;height:{height}px">')
+COMPACT_HTML_TAIL = "</div></body></html>"
+COMPACT_PRECISION = 2
+
+ALIGN_MAP = {
+    'left': 'left',
+    'right': 'right',
+    'center': 'center',
+    'justify': 'justify',
+    'general': 'left',
+    'distributed': 'justify'
+}
+
+def format_px(value, precision=None):
+    # precision=None : valeur brute ; sinon arrondi à `precision` décimales
+    if precision is None:
+        return f"{value}"
+    text = f"{value:.{precision}f}"
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    return '0' if text == '-0' else text
+
+def render_cell_html(cell, col_widths, row_heights, scale_x, scale_y, zoom_scale=100, precision=None, compact=False):
+    left = calculate_position(cell['col'], 0, col_widths, True) * scale_x
+    top = calculate_position(cell['row'], 0, row_heights, False) * scale_y
+    width = col_widths.get(cell['col'], DEFAULT_COL_WIDTH) * PIXELS_PER_POINT * scale_x
+    height = row_heights.get(cell['row'], DEFAULT_ROW_HEIGHT) * PIXELS_PER_POINT * scale_y
+
+    font_px = points_to_pixels(cell['style']['size']) * (zoom_scale / 100) * scale_y
+
+    vertical_align = cell['style'].get('vertical', 'bottom')
+    cell_height = row_heights.get(cell['row'], DEFAULT_ROW_HEIGHT) * PIXELS_PER_POINT * scale_y
+
+    if vertical_align == 'center':
+        top += (cell_height - height) / 2
+    elif vertical_align == 'bottom':
+        top += cell_height - height
+
+    style = f"font-size:{format_px(font_px, precision)}px; font-family:'{cell['style'].get('font', 'Calibri')}', sans-serif;"
+    if cell['style']['bold']:
+        style += "font-weight:bold;"
+    if cell['style']['italic']:
+        style += "font-style:italic;"
+    if cell['style']['underline']:
+        style += "text-decoration:underline;"
+    if cell['style']['color']:
+        style += f"color:#{cell['style']['color']};"
+    if cell['style']['bg_color']:
+        style += f"background-color:#{cell['style']['bg_color']};"
+
+    style += border_to_style_full(cell['style'])
+
+    align = ALIGN_MAP.get(cell['style']['align'], 'left')
+    style += f"text-align:{align};"
+
+    if cell['style']['wrap']:
+        style += "white-space:normal; overflow:visible;"
+    else:
+        style += "white-space:nowrap;"
 
-   
-    for row in sheet_data:
-        for cell in row:
-            left = calculate_position(cell['col'], 0, col_widths, True) * scale_x
-            top = calculate_position(cell['row'], 0, row_heights, False) * scale_y
-            width = col_widths.get(cell['col'], DEFAULT_COL_WIDTH) * PIXELS_PER_POINT * scale_x
-            height = row_heights.get(cell['row'], DEFAULT_ROW_HEIGHT) * PIXELS_PER_POINT * scale_y
-
-            font_px = points_to_pixels(cell['style']['size']) * (zoom_scale / 100) * scale_y
-
-            vertical_align = cell['style'].get('vertical', 'bottom')
-            cell_height = row_heights.get(cell['row'], DEFAULT_ROW_HEIGHT) * PIXELS_PER_POINT * scale_y
-
-            if vertical_align == 'center':
-                top += (cell_height - height) / 2
-            elif vertical_align == 'bottom':
-                top += cell_height - height
-
-            style = f"font-size:{font_px}px; font-family:'{cell['style'].get('font', 'Calibri')}', sans-serif;"
-            if cell['style']['bold']:
-                style += "font-weight:bold;"
-            if cell['style']['italic']:
-                style += "font-style:italic;"
-            if cell['style']['underline']:
-                style += "text-decoration:underline;"
-            if cell['style']['color']:
-                style += f"color:#{cell['style']['color']};"
-            if cell['style']['bg_color']:
-                style += f"background-color:#{cell['style']['bg_color']};"
-
-            style += border_to_style_full(cell['style'])
-
-            align_map = {
-                'left': 'left',
-                'right': 'right',
-                'center': 'center',
-                'justify': 'justify',
-                'general': 'left',
-                'distributed': 'justify'
-            }
-            align = align_map.get(cell['style']['align'], 'left')
-            style += f"text-align:{align};"
-
-            if cell['style']['wrap']:
-                style += "white-space:normal; overflow:visible;"
-            else:
-                style += "white-space:nowrap;"
+    cell_value_html = cell['value'].replace('\n', '<br>')
+    left, top, width, height = (format_px(v, precision) for v in (left, top, width, height))
 
-            cell_value_html = cell['value'].replace('\n', '<br>')
+    if compact:
+        style = style.replace("; ", ";").replace("', sans-serif", "',sans-serif")
+        return (f'<div style="position:absolute;left:{left}px;top:{top}px;width:{width}px;height:{height}px;'
+                f'{style}box-sizing:border-box;overflow:hidden">{cell_value_html}</div>')
 
-            html += f"""
+    return f"""
 <div style="position:absolute; left:{left}px; top:{top}px; width:{width}px; height:{height}px; {style} box-sizing:border-box; overflow:hidden;">
     {cell_value_html}
 </div>
 """
 
+def render_image_html(img, scale_x, scale_y, precision=None, compact=False):
+    img_left, img_top, img_width, img_height = (
+        format_px(v, precision) for v in (img['left'] * scale_x, img['top'] * scale_y,
+                                          img['width'] * scale_x, img['height'] * scale_y))
 
-    images_by_cell = defaultdict(list)
-    for img in images:
-       
-        img_left = img['left'] * scale_x
-        img_top = img['top'] * scale_y
-        img_width = img['width'] * scale_x
-        img_height = img['height'] * scale_y
+    if compact:
+        return (f'<img src="{img["data_uri"]}" alt="Image" style="position:absolute;left:{img_left}px;'
+                f'top:{img_top}px;width:{img_width}px;height:{img_height}px;object-fit:contain">')
 
-        html += f"""
+    return f"""
     <img src="{img['data_uri']}" alt="Image"
          style="position:absolute; left:{img_left}px; top:{img_top}px;
                 width:{img_width}px; height:{img_height}px; object-fit:contain;">
     """
 
-      
-
-  
-    for (row, col), cell_images in images_by_cell.items():
-        cell_left = calculate_position(col, 0, col_widths, True) * scale_x
-        cell_top = calculate_position(row, 0, row_heights, False) * scale_y
-        cell_width = col_widths.get(col, DEFAULT_COL_WIDTH) * PIXELS_PER_POINT * scale_x
-        cell_height = row_heights.get(row, DEFAULT_ROW_HEIGHT) * PIXELS_PER_POINT * scale_y
+def write_precompressed(output_file, data):
+    # fichiers .gz / .br à côté du HTML, servis tels quels par le serveur statique
+    with open(output_file + '.gz', 'wb') as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    with open(output_file + '.br', 'wb') as f:
+        f.write(brotli.compress(data, quality=11))
 
-        html += f"""
-<div style="position:absolute; left:{cell_left}px; top:{cell_top}px; width:{cell_width}px; height:{cell_height}px;
-            display:flex; flex-wrap:wrap; align-items:center; justify-content:center; box-sizing:border-box;">
-"""
+def write_html_page(output_file, body_parts, width, height, compact=False, precompress=False):
+    # assemble en-tête + fragments + fin de page, écrit le HTML (et ses .gz/.br)
+    head, tail = (COMPACT_HTML_HEAD, COMPACT_HTML_TAIL) if compact else (HTML_HEAD, HTML_TAIL)
+    html = head.format(width=width, height=height) + "".join(body_parts) + tail
 
-        for img in cell_images:
-            img_width = img['width'] * scale_x
-            img_height = img['height'] * scale_y
-            html += f"""
-    <img src="{img['data_uri']}" alt="Image" style="max-width:{img_width}px; max-height:{img_height}px;
-             object-fit:contain; margin:2px;">
-"""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html)
+    if precompress:
+        write_precompressed(output_file, html.encode('utf-8'))
 
-        html += "</div>"
+def generate_html(sheet_data, images, col_widths, row_heights, output_file, zoom_scale=100, target_width=500,
+                  compact=False, precision=None, precompress=False):
+    # compact : HTML minifié, coordonnées arrondies (COMPACT_PRECISION par défaut)
+    print_dimensions_before_after(col_widths, row_heights, target_width)
 
-    html += """
-</div>
-</body>
-</html>
-"""
+    new_width, new_height, scale_x, scale_y = compute_html_scale(col_widths, row_heights, target_width)
+    if compact and precision is None:
+        precision = COMPACT_PRECISION
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html)
-    print(f"✅ Fichier HTML généré avec échelle : {output_file}")
+    parts = []
+    for row in sheet_data:
+        for cell in row:
+            parts.append(render_cell_html(cell, col_widths, row_heights, scale_x, scale_y, zoom_scale,
+                                          precision, compact))
 
-def main():
-    input_file = r"xlsx\Etiquette CLEMENTINE (10).xlsx"
-    output_file = "fidele.html"
+    for img in images:
+        parts.append(render_image_html(img, scale_x, scale_y, precision, compact))
 
+    write_html_page(output_file, parts, new_width, new_height, compact, precompress)
+    print(f"✅ Fichier HTML généré avec échelle : {output_file}")
 
-    wb = load_workbook(input_file)
-    sheet_name = wb.sheetnames[0]
+@contextmanager
+def open_workbook(source, use_mmap=False):
+    # source : chemin, bytes, memoryview, objet fichier ; le contenu n'est lu
+    # qu'une seule fois puis partagé entre openpyxl et zipfile.
+    with open_source(source, use_mmap=use_mmap) as buffer:
+        with BufferReader(buffer) as wb_reader:
+            wb = load_workbook(wb_reader)
+        with BufferReader(buffer) as zip_reader, zipfile.ZipFile(zip_reader) as zipf:
+            yield wb, zipf
+
+def get_sheet_layout(wb, zipf, sheet_name):
+    col_widths = get_column_widths(wb, sheet_name)
+    row_heights = get_row_heights(wb, sheet_name)
+    sheet_path = [f for f in zipf.namelist() if f.startswith('xl/worksheets/sheet')][0]
+    zoom_scale = get_sheet_zoom(zipf, sheet_path)
+    return col_widths, row_heights, zoom_scale
+
+def extract_drawings(zipf, col_widths, row_heights, scale=1.0, device_pixel_ratio=DEVICE_PIXEL_RATIO,
+                     encoder=None, media_cache=None):
+    all_images = []
+    drawings = [f for f in zipf.namelist() if f.startswith('xl/drawings/drawing')]
+    for drawing_path in drawings:
+        all_images.extend(parse_drawing(zipf, drawing_path, col_widths, row_heights, scale, device_pixel_ratio,
+                                        encoder, media_cache))
+    return all_images
+
+def convert_excel_to_html(source, output_file, sheet_name=None, use_mmap=False, target_width=500,
+                          device_pixel_ratio=DEVICE_PIXEL_RATIO, profile=DEFAULT_PROFILE, time_budget=None,
+                          template_cache=TEMPLATE_CACHE, compact=False, precision=None, precompress=False):
+    # template_cache=None désactive la réutilisation entre classeurs.
+    encoder = ImageEncoder(profile, time_budget)
+    with open_workbook(source, use_mmap) as (wb, zipf):
+        if sheet_name is None:
+            sheet_name = wb.sheetnames[0]
+        col_widths, row_heights, zoom_scale = get_sheet_layout(wb, zipf, sheet_name)
+
+        if template_cache is not None:
+            template = template_cache.get(template_fingerprint(zipf))
+            media_cache = template_cache.media
+        else:
+            template = {'styles': None, 'cell_styles': {}}
+            media_cache = {}
+        styles, cell_styles = template['styles'], template['cell_styles']
+        if styles is None:
+            styles = extract_styles_from_xml(zipf)
+            if styles is not None:
+                styles = template['styles'] = freeze(styles)
+            else:
+                # échec de lecture : styles par défaut pour ce classeur, rien n'est mis en cache
+                styles, cell_styles = {}, {}
 
-    with zipfile.ZipFile(input_file) as zipf:
-      
-        sheet_data = get_sheet_data(wb, zipf, sheet_name)
-        col_widths = get_column_widths(wb, sheet_name)
-        row_heights = get_row_heights(wb, sheet_name)
+        sheet_data = get_sheet_data(wb, zipf, sheet_name, styles, cell_styles)
 
-       
-        sheet_path = f'xl/worksheets/{sheet_name}.xml'  
-        
-      
-        sheet_path = [f for f in zipf.namelist() if f.startswith('xl/worksheets/sheet')][0]
+        _, _, scale_x, _ = compute_html_scale(col_widths, row_heights, target_width)
+        all_images = extract_drawings(zipf, col_widths, row_heights, scale_x, device_pixel_ratio,
+                                      encoder, media_cache)
 
-        zoom_scale = get_sheet_zoom(zipf, sheet_path)
-      
-        all_images = []
-        drawings = [f for f in zipf.namelist() if f.startswith('xl/drawings/drawing')]
+    generate_html(sheet_data, all_images, col_widths, row_heights, output_file, zoom_scale, target_width,
+                  compact, precision, precompress)
 
-        for drawing_path in drawings:
-            images = parse_drawing(zipf, drawing_path, col_widths, row_heights)
-            all_images.extend(images)
+def main():
+    logging.basicConfig(format="⚠ %(message)s")
+    input_file = r"xlsx\Etiquette CLEMENTINE (10).xlsx"
+    output_file = "fidele.html"
 
-  
-    generate_html(sheet_data, all_images, col_widths, row_heights, output_file, zoom_scale)
+    convert_excel_to_html(input_file, output_file)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,87 @@
+import base64
+import io
+import logging
+import time
+
+from PIL import Image
+
+try:
+    import pillow_avif  # noqa: F401  (enregistre le format AVIF dans Pillow < 11.2)
+except ImportError:
+    pass
+# Pillow >= 11.2 encode l'AVIF nativement, sans le plugin
+Image.init()
+AVIF_AVAILABLE = "AVIF" in Image.SAVE
+
+# Profils d'encodage, du plus rapide au plus compact.
+# "options" sont passées telles quelles à Image.save :
+#   WEBP -> method 0 (rapide) .. 6 (lent)   AVIF -> speed 10 (rapide) .. 0 (lent)
+# "icon_quality" s'applique aux petites images / images en niveaux de gris (icônes PDF).
+ENCODER_PROFILES = {
+    "fast": {"format": "WEBP", "quality": 60, "icon_quality": 30, "options": {"method": 0}},
+    "balanced": {"format": "AVIF", "quality": 50, "icon_quality": 20, "options": {"speed": 8}},
+    "smallest": {"format": "AVIF", "quality": 40, "icon_quality": 10, "options": {"speed": 4}},
+}
+# ordre de repli quand le budget de temps est dépassé
+PROFILE_LADDER = ["smallest", "balanced", "fast"]
+# choisi d'après benchmark_encodeurs.md : "smallest" gagne ~30 % d'octets sur
+# "balanced" mais coûte ~15 fois plus de temps d'encodage
+DEFAULT_PROFILE = "balanced"
+
+logger = logging.getLogger(__name__)
+
+MIME_TYPES = {"WEBP": "image/webp", "AVIF": "image/avif"}
+
+
+class ImageEncoder:
+    # Un encodeur par document : time_budget (secondes) borne le temps total
+    # d'encodage ; au-delà, on passe au profil plus rapide suivant.
+    def __init__(self, profile=DEFAULT_PROFILE, time_budget=None):
+        if profile not in ENCODER_PROFILES:
+            raise ValueError(f"Profil d'encodage inconnu : {profile}")
+        self.profile = profile
+        self.time_budget = time_budget
+        self.elapsed = 0.0
+        self.stats = {}
+
+    @property
+    def settings(self):
+        # réglages réellement appliqués (format, quality, options) pour le profil courant
+        settings = ENCODER_PROFILES[self.profile]
+        if settings["format"] == "AVIF" and not AVIF_AVAILABLE:
+            # pillow-avif-plugin absent : WEBP avec un effort équivalent
+            return {"format": "WEBP", "quality": settings["quality"], "icon_quality": settings["icon_quality"],
+                    "options": {"method": 4}}
+        return settings
+
+    def _step_down(self):
+        index = PROFILE_LADDER.index(self.profile)
+        if index + 1 < len(PROFILE_LADDER):
+            self.profile = PROFILE_LADDER[index + 1]
+            # changement de réglage voulu, pas une erreur : niveau INFO
+            logger.info("Budget d'encodage dépassé (%.2fs), passage au profil '%s'", self.elapsed, self.profile)
+
+    def encode(self, img, quality=None, icon=False):
+        # quality=None : qualité du profil (icon_quality pour une icône)
+        settings = self.settings
+        profile = self.profile
+        if quality is None:
+            quality = settings["icon_quality"] if icon else settings["quality"]
+
+        start = time.perf_counter()
+        buf = io.BytesIO()
+        img.save(buf, format=settings["format"], quality=quality, **settings["options"])
+        data = buf.getvalue()
+        duration = time.perf_counter() - start
+
+        self.elapsed += duration
+        entry = self.stats.setdefault(profile, {"images": 0, "seconds": 0.0, "bytes": 0})
+        entry["images"] += 1
+        entry["seconds"] += duration
+        entry["bytes"] += len(data)
+
+        if self.time_budget is not None and self.elapsed > self.time_budget:
+            self._step_down()
+
+        mime = MIME_TYPES[settings["format"]]
+        return f"data:{mime};base64," + base64.b64encode(data).decode("utf-8")
@@ -0,0 +1,99 @@
+import io
+import mmap
+import os
+from contextlib import contextmanager
+
+
+class BufferReader(io.RawIOBase):
+    # Lecteur en lecture seule sur un buffer partagé : chaque lecteur a sa
+    # propre position, mais aucun ne copie le buffer complet.
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        n = min(len(b), len(self._view) - self._pos)
+        if n <= 0:
+            return 0
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"whence invalide : {whence}")
+        if pos < 0:
+            raise ValueError(f"position négative : {pos}")
+        self._pos = pos
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def _try_mmap(f):
+    # mmap impossible sans descripteur réel (BytesIO, flux réseau) ou sur un
+    # fichier vide : on renvoie None et l'appelant lit le contenu en mémoire.
+    try:
+        fileno = f.fileno()
+    except (OSError, io.UnsupportedOperation, AttributeError):
+        return None
+    if os.fstat(fileno).st_size == 0:
+        return None
+    return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+
+
+def _read_all(f):
+    if isinstance(f, io.BytesIO):
+        # vue sur le buffer interne, sans copie
+        return f.getbuffer()
+    if hasattr(f, "seek"):
+        f.seek(0)
+    return f.read()
+
+
+@contextmanager
+def open_source(source, use_mmap=False):
+    # source : chemin, bytes, bytearray, memoryview, mmap ou objet fichier.
+    # Renvoie un memoryview unique, partagé par tous les lecteurs internes.
+    # use_mmap est ignoré quand la source ne peut pas être projetée en mémoire.
+    mapped = None
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            mapped = _try_mmap(f) if use_mmap else None
+            data = mapped if mapped is not None else f.read()
+    elif isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        data = source
+    elif hasattr(source, "read"):
+        mapped = _try_mmap(source) if use_mmap else None
+        data = mapped if mapped is not None else _read_all(source)
+    else:
+        raise TypeError(f"Type de source non supporté : {type(source).__name__}")
+
+    view = memoryview(data).cast("B")
+    try:
+        yield view
+    finally:
+        view.release()
+        if isinstance(data, memoryview) and data is not source:
+            data.release()
+        if mapped is not None:
+            mapped.close()
@@ -1,10 +1,17 @@
 import fitz  # PyMuPDF
 import json
+import math
 import base64
 from PIL import Image
 from skimage import io as skio
 import io as pyio
-import pillow_avif  
+from input_source import open_source
+from image_encoder import ImageEncoder, DEFAULT_PROFILE
+
+# densité d'affichage visée : 2 = écrans « retina »
+DEVICE_PIXEL_RATIO = 2.0
+# formats que le navigateur affiche tels quels (pas de réencodage nécessaire)
+PASSTHROUGH_EXTS = {"png": "image/png", "jpeg": "image/jpeg", "jpg": "image/jpeg"}
 
 
 def int_color_to_hex(color):
@@ -21,7 +28,7 @@ def int_color_to_hex(color):
     return '#000000'
 
 
-def process_image_bytes(img_bytes, max_width=150, quality=50, force_white_bg=True):
+def process_image_bytes(img_bytes, max_width=150, quality=None, force_white_bg=True, encoder=None, icon=False):
     pil_img = Image.open(pyio.BytesIO(img_bytes))
 
     if pil_img.mode != "RGBA":
@@ -40,13 +47,43 @@ def process_image_bytes(img_bytes, max_width=150, quality=50, force_white_bg=Tru
         new_h = int(h * ratio)
         pil_img = pil_img.resize((max_width, new_h), Image.LANCZOS)
 
-    buf = pyio.BytesIO()
-    pil_img.save(buf, format="AVIF", quality=quality)
-    return "data:image/avif;base64," + base64.b64encode(buf.getvalue()).decode("utf-8"), aspect_ratio
+    if encoder is None:
+        encoder = ImageEncoder()
+    return encoder.encode(pil_img, quality=quality, icon=icon), aspect_ratio
+
+
+def open_pdf_document(buffer):
+    # PyMuPDF (testé en 1.28) ouvre un memoryview sans le copier : le buffer
+    # de open_source (bytes, upload ou mmap) est lu directement par MuPDF.
+    # Une version qui refuse le memoryview lève TypeError, sans repli silencieux.
+    return fitz.open(stream=buffer, filetype="pdf")
+
+
+def target_image_width(bbox, scale_factor, device_pixel_ratio, fallback):
+    # largeur utile en pixels = largeur affichée * échelle de page * DPR
+    if bbox.is_empty or bbox.is_infinite:
+        return fallback
+    return max(1, math.ceil(bbox.width * scale_factor * device_pixel_ratio))
+
+
+def extract_pdf_to_json(pdf_source, max_image_width=150, quality=None, scale_factor=1.0, use_mmap=False,
+                        device_pixel_ratio=DEVICE_PIXEL_RATIO, profile=DEFAULT_PROFILE, time_budget=None):
+    # quality=None : qualités du profil d'encodage (images et icônes) ;
+    # un entier force cette qualité pour toutes les images. time_budget en secondes
+    encoder = ImageEncoder(profile, time_budget)
+    with open_source(pdf_source, use_mmap=use_mmap) as buffer:
+        doc = open_pdf_document(buffer)
+        try:
+            return extract_document_to_json(doc, max_image_width, quality, scale_factor, device_pixel_ratio,
+                                            encoder)
+        finally:
+            doc.close()
 
 
-def extract_pdf_to_json(pdf_path, max_image_width=150, quality=10, scale_factor=1.0):
-    doc = fitz.open(pdf_path)
+def extract_document_to_json(doc, max_image_width=150, quality=None, scale_factor=1.0,
+                             device_pixel_ratio=DEVICE_PIXEL_RATIO, encoder=None):
+    if encoder is None:
+        encoder = ImageEncoder()
     pages = []
 
     for page_num in range(len(doc)):
@@ -109,6 +146,7 @@ def extract_pdf_to_json(pdf_path, max_image_width=150, quality=10, scale_factor=
             bbox = page.get_image_bbox(img)
             base_image = doc.extract_image(xref)
             img_bytes = base_image["image"]
+            target_w = target_image_width(bbox, scale_factor, device_pixel_ratio, max_image_width)
 
             smask_xref = base_image.get("smask")
             if smask_xref:
@@ -121,17 +159,23 @@ def extract_pdf_to_json(pdf_path, max_image_width=150, quality=10, scale_factor=
 
                 img_pil = Image.alpha_composite(Image.new("RGBA", img_pil.size, (255, 255, 255, 255)), img_pil)
                 img_pil = img_pil.convert("RGB")
+                if img_pil.width > target_w:
+                    new_h = max(1, int(img_pil.height * target_w / img_pil.width))
+                    img_pil = img_pil.resize((target_w, new_h), Image.LANCZOS)
 
-                buf = pyio.BytesIO()
-                img_pil.save(buf, format="AVIF", quality=quality)
-                img_base64 = "data:image/avif;base64," + base64.b64encode(buf.getvalue()).decode("utf-8")
+                img_base64 = encoder.encode(img_pil, quality=quality)
                 aspect_ratio = img_pil.width / img_pil.height  
+            elif (base_image.get("ext") in PASSTHROUGH_EXTS and base_image.get("colorspace") in (1, 3)
+                  and base_image["width"] <= target_w):
+                # déjà à la taille affichée ou en dessous : pas de réencodage
+                mime = PASSTHROUGH_EXTS[base_image["ext"]]
+                img_base64 = f"data:{mime};base64," + base64.b64encode(img_bytes).decode("utf-8")
+                aspect_ratio = base_image["width"] / base_image["height"]
             else:
                 img_np = skio.imread(pyio.BytesIO(img_bytes))
                 is_icon = img_np.ndim == 2 or (img_np.shape[-1] == 1) or max(img_np.shape[:2]) <= 64
-                max_w = 32 if is_icon else max_image_width
-                q = 5 if is_icon else quality
-                img_base64, aspect_ratio = process_image_bytes(img_bytes, max_width=max_w, quality=q)
+                img_base64, aspect_ratio = process_image_bytes(img_bytes, max_width=target_w, quality=quality,
+                                                               encoder=encoder, icon=is_icon)
 
             images.append({
                 "top": int(bbox.y0 * scale_factor),
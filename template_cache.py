@@ -0,0 +1,109 @@
+import hashlib
+from collections import OrderedDict
+from types import MappingProxyType
+
+TEMPLATE_CACHE_SIZE = 16
+# taille maximale (en caractères de data URI) des médias encodés gardés en mémoire
+MEDIA_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def media_key(data):
+    # empreinte des octets réels : le CRC annoncé par le répertoire central
+    # du zip n'est pas vérifié sans relire le média et peut être falsifié
+    return hashlib.sha1(data).hexdigest()
+
+
+def freeze(value):
+    # vue en lecture seule (récursive) : les styles mis en cache sont partagés
+    # entre toutes les cellules et tous les classeurs d'un même modèle
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    return value
+
+
+def template_fingerprint(zipf):
+    # Empreinte des parties communes aux classeurs issus d'un même modèle :
+    # styles.xml, thème(s) et médias (empreinte de leur contenu).
+    # Les dimensions n'en font pas partie : un classeur avec plus de lignes
+    # partage les mêmes styles ; ce qui dépend de la géométrie (largeur cible
+    # des médias) porte sa propre clé.
+    h = hashlib.sha1()
+    names = zipf.namelist()
+    for name in ['xl/styles.xml'] + sorted(n for n in names if n.startswith('xl/theme/')):
+        if name in names:
+            h.update(name.encode())
+            h.update(zipf.read(name))
+    # les médias sont identifiés par leur contenu : un même logo peut porter
+    # un nom différent (image2.jpg / image7.jpg) d'un export à l'autre
+    h.update(repr(sorted(media_key(zipf.read(name)) for name in names
+                         if name.startswith('xl/media/'))).encode())
+    return h.hexdigest()
+
+
+class MediaCache:
+    # data URI encodées par (contenu, largeur cible, profil) : LRU borné par
+    # la taille totale des data URI, les plus anciennes sont évincées
+    def __init__(self, max_bytes=MEDIA_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self.size = 0
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __getitem__(self, key):
+        value = self._items[key]
+        self._items.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self._items:
+            self.size -= len(self._items.pop(key))
+        if len(value) > self.max_bytes:
+            return
+        self._items[key] = value
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, old = self._items.popitem(last=False)
+            self.size -= len(old)
+
+    def clear(self):
+        self._items.clear()
+        self.size = 0
+
+    def __len__(self):
+        return len(self._items)
+
+
+class TemplateCache:
+    # Cache LRU borné, partagé par le processus. Chaque entrée contient :
+    #   styles      -> table de styles issue de extract_styles_from_xml (figée)
+    #   cell_styles -> style résolu par style_id (get_cell_style, figé)
+    # Les médias encodés sont identifiés par leur contenu : ils ne dépendent
+    # pas du modèle et vont dans un seul cache borné en octets (media).
+    def __init__(self, max_entries=TEMPLATE_CACHE_SIZE, max_media_bytes=MEDIA_CACHE_BYTES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.media = MediaCache(max_media_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fingerprint):
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            self.misses += 1
+            entry = {'styles': None, 'cell_styles': {}}
+            self._entries[fingerprint] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(fingerprint)
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+        self.media.clear()
+
+    def __len__(self):
+        return len(self._entries)